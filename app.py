@@ -1,11 +1,16 @@
-import datetime
+import html
+import threading
+import time
 from zoneinfo import ZoneInfo
 from typing import Optional, List, Dict
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 import streamlit.components.v1 as components
 from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
 from google.oauth2 import service_account
 from streamlit_autorefresh import st_autorefresh
 
@@ -14,7 +19,101 @@ from streamlit_autorefresh import st_autorefresh
 # -------------------------
 REFRESH_INTERVAL_MS = 15000      # Streamlit auto-refresh interval
 WINDOW_HOURS = 6                 # How far back to compute net change for ticker
-MOVER_DOC_LIMIT = 50             # How many mover docs to pull for that window
+MOVER_DOC_LIMIT = 50             # How many mover docs to pull for the table and net change
+FEED_WAIT_SECONDS = 5            # How long a rerun waits for the first live snapshot
+FEED_RESTART_SECONDS = 60        # Minimum gap between listener restarts
+MARKETS_FALLBACK_TTL = 5         # Seconds a direct read is shared while the listener is down
+MOVERS_CACHE_TTL = 10            # Seconds a movers query result is shared across reruns
+LATEST_MOVERS_CHECK_TTL = 300    # Seconds between checks for the latest_movers summary doc
+EASTERN = ZoneInfo("America/New_York")  # Display timezone for mover times
+
+# Columns shown in the movers table, in display order
+MOVER_DISPLAY_COLS = pd.Index(["time", "team", "old", "new", "change", "direction"])
+
+# -------------------------
+# STATIC MARKUP
+# -------------------------
+# Plain literals: reruns load them, never re-format them.
+
+# Ticker arrow + CSS class, indexed by np.sign of the delta:
+# 0 -> flat, 1 -> up, -1 -> down (last entry)
+DIRECTION_STYLE = (
+    {"arrow": "", "cls": "delta-flat"},
+    {"arrow": "▲", "cls": "delta-up"},
+    {"arrow": "▼", "cls": "delta-down"},
+)
+
+TICKER_CSS = """
+body { margin:0; padding:0; }
+.ticker-wrapper {
+  width: 100%; background:#020617; overflow:hidden;
+  border-radius:16px; padding:8px 0;
+  border:1px solid rgba(148,163,184,0.5);
+  box-shadow:0 10px 24px rgba(15,23,42,0.9);
+}
+.ticker-track {
+  display:inline-flex; white-space:nowrap;
+  animation:scroll 50s linear infinite;
+}
+@keyframes scroll {
+  from { transform:translateX(0%); }
+  to   { transform:translateX(-50%); }
+}
+.ticker-item {
+  display:inline-flex; align-items:baseline; gap:6px;
+  padding:4px 14px; margin-right:18px;
+  border-radius:999px;
+  background:rgba(255,255,255,0.06);
+  font-family:sans-serif; font-size:0.9rem;
+}
+.ticker-team {
+  color:#fff; font-weight:600; text-transform:uppercase;
+  letter-spacing:0.07em;
+}
+.ticker-prob {
+  color:#a5b4fc; font-variant-numeric:tabular-nums;
+}
+.ticker-delta {
+  font-size:0.8rem; font-variant-numeric:tabular-nums;
+}
+.delta-up   { color:#22c55e; }
+.delta-down { color:#ef4444; }
+.delta-flat { color:#94a3b8; }
+"""
+
+# One ticker pill, e.g. "TEX 45.0%  ▲ +8"
+TICKER_ITEM_HTML = """
+      <div class="ticker-item">
+        <span class="ticker-team">{team}</span>
+        <span class="ticker-prob">{prob}</span>
+        <span class="ticker-delta {cls}">{arrow} {delta}</span>
+      </div>
+    """
+
+# Page skeleton for the ticker iframe; only {TRACK} is filled per rerun
+TICKER_HTML_TEMPLATE = (
+    """
+<html>
+<head>
+<style>
+"""
+    + TICKER_CSS
+    + """</style>
+</head>
+<body>
+<div class="ticker-wrapper">
+  <div class="ticker-track">{TRACK}</div>
+</div>
+<script>
+  // The -50% scroll needs two copies back to back to loop seamlessly;
+  // clone them here instead of shipping the items twice.
+  const track = document.querySelector(".ticker-track");
+  track.innerHTML += track.innerHTML;
+</script>
+</body>
+</html>
+"""
+)
 
 # -------------------------
 # PAGE CONFIG
@@ -29,12 +128,65 @@ st.set_page_config(
 # -------------------------
 @st.cache_resource
 def get_db():
-    creds_dict = st.secrets["firebase"]
+    # Plain dict once: both lookups below skip the secrets AttrDict
+    creds_dict = dict(st.secrets["firebase"])
     creds = service_account.Credentials.from_service_account_info(creds_dict)
-    return firestore.Client(credentials=creds, project=creds_dict["project_id"])
+    return firestore.Client(
+        credentials=creds, project=creds_dict["project_id"], database="(default)"
+    )
 
 db = get_db()
 
+
+@st.cache_resource
+def get_markets_feed() -> Dict:
+    """
+    Keep cfp_markets/current in memory via a Firestore snapshot listener,
+    so reruns read the latest payload instead of issuing a get().
+    Firestore pushes a new snapshot only when the document changes.
+    """
+    feed: Dict = {
+        "payload": None,
+        "ready": threading.Event(),
+        "started": time.monotonic(),
+        "timed_out": False,
+    }
+
+    def on_snapshot(doc_snapshots, changes, read_time):
+        # A deleted / missing document arrives as an empty snapshot list
+        snap = doc_snapshots[0] if doc_snapshots else None
+        feed["payload"] = (snap.to_dict() or {}) if snap is not None else None
+        feed["ready"].set()
+
+    feed["watch"] = db.collection("cfp_markets").document("current").on_snapshot(on_snapshot)
+    return feed
+
+
+@st.cache_resource
+def get_feed_lock() -> threading.Lock:
+    """Serializes listener restarts across sessions."""
+    return threading.Lock()
+
+
+@st.cache_resource
+def get_movers_store(limit_docs: int) -> Dict:
+    """
+    Up to `limit_docs` mover snapshots already read from Firestore, newest
+    first, as dicts of id / raw timestamp / parsed ts_dt / items. Shared
+    across sessions so each refresh only queries docs from the head on.
+    """
+    return {"docs": [], "lock": threading.Lock()}
+
+
+@st.cache_data(ttl=LATEST_MOVERS_CHECK_TTL, show_spinner=False)
+def has_latest_movers_doc() -> bool:
+    """
+    Whether the writer maintains cfp_markets/latest_movers. Rechecked every
+    LATEST_MOVERS_CHECK_TTL seconds, so deployments without it don't pay a
+    read per refresh and one that starts (or stops) writing it is noticed.
+    """
+    return db.collection("cfp_markets").document("latest_movers").get().exists
+
 # -------------------------
 # AUTO REFRESH
 # -------------------------
@@ -47,12 +199,10 @@ def team_from_ticker(ticker: str) -> str:
     return ticker.split("-")[-1] if ticker else ""
 
 
-def prob_text(prob: Optional[float]) -> str:
-    return "--" if prob is None else f"{prob * 100:.1f}%"
-
-
-def prob_pct(prob: Optional[float]) -> Optional[float]:
-    return None if prob is None else round(prob * 100, 1)
+def market_team(market: Dict) -> str:
+    """Writer-supplied "team" if it is a non-empty string, else split from the ticker."""
+    team = market.get("team")
+    return team if isinstance(team, str) and team else team_from_ticker(market.get("ticker"))
 
 
 def delta_points_text(delta: Optional[float]) -> str:
@@ -65,109 +215,190 @@ def delta_points_text(delta: Optional[float]) -> str:
     return f"{sign}{delta:.0f}"
 
 
-def pretty_time(ts: str) -> str:
-    """Convert Firestore UTC timestamp string -> America/New_York readable."""
-    try:
-        # Handle both "...Z" and plain ISO
-        if ts.endswith("Z"):
-            dt_utc = datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        else:
-            dt_utc = datetime.datetime.fromisoformat(ts)
-            if dt_utc.tzinfo is None:
-                dt_utc = dt_utc.replace(tzinfo=datetime.timezone.utc)
-
-        eastern = ZoneInfo("America/New_York")
-        dt_local = dt_utc.astimezone(eastern)
-        now_local = datetime.datetime.now(eastern)
-        diff = now_local - dt_local
-    except Exception:
-        return ts
-
-    if diff.days == 0:
-        return dt_local.strftime("%-I:%M %p")
-    if diff.days < 7:
-        return dt_local.strftime("%a %-I:%M %p")
-    return dt_local.strftime("%b %-d, %-I:%M %p")
-
-
-def parse_ts_utc(ts: str) -> Optional[datetime.datetime]:
-    try:
-        if ts.endswith("Z"):
-            return datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        dt = datetime.datetime.fromisoformat(ts)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=datetime.timezone.utc)
-        return dt
-    except Exception:
-        return None
+def parse_ts_utc(ts: pd.Series) -> pd.Series:
+    """Parse Firestore ISO timestamp strings ("...Z" or plain) as UTC; bad values -> NaT."""
+    return pd.to_datetime(ts, utc=True, format="ISO8601", errors="coerce")
+
+
+def pretty_times(ts_dt: pd.Series, ts_raw: pd.Series, now: pd.Timestamp) -> pd.Series:
+    """Convert parsed UTC timestamps -> America/New_York readable, aged against `now`."""
+    # Every item in a mover snapshot shares its timestamp, so format each
+    # distinct timestamp once and broadcast back (NaT -> code -1)
+    codes, uniques = pd.factorize(ts_dt)
+    dt_local = uniques.tz_convert(EASTERN)
+    age_days = (now - uniques).days
+
+    pretty = np.select(
+        [age_days == 0, age_days < 7],
+        [dt_local.strftime("%-I:%M %p"), dt_local.strftime("%a %-I:%M %p")],
+        default=dt_local.strftime("%b %-d, %-I:%M %p"),
+    )
+    pretty = pd.Series(pretty).reindex(codes).to_numpy()
+    # Unparseable timestamps are shown as-is
+    return pd.Series(pretty, index=ts_dt.index).where(ts_dt.notna(), ts_raw)
 
 
 # -------------------------
 # CACHED FIRESTORE READS
 # -------------------------
-@st.cache_data(ttl=5)
-def load_current_markets() -> Optional[Dict]:
+@st.cache_data(ttl=MARKETS_FALLBACK_TTL, show_spinner=False)
+def read_current_markets() -> Optional[Dict]:
+    """Direct read of cfp_markets/current, used while the listener has no snapshot."""
     doc = db.collection("cfp_markets").document("current").get()
     if not doc.exists:
         return None
     return doc.to_dict() or {}
 
 
-@st.cache_data(ttl=5)
-def load_recent_movers_raw(limit_docs: int = MOVER_DOC_LIMIT) -> List[Dict]:
+def load_current_markets() -> Optional[Dict]:
+    """
+    Latest cfp_markets/current payload (shared across sessions, read-only).
+    Served from the snapshot listener; falls back to a direct read only
+    until the listener has delivered its first snapshot.
+    """
+    feed = get_markets_feed()
+    # is_active is also False while the watch resets its own stream, so only
+    # restart one that has stayed down past the backoff
+    if (
+        not feed["watch"].is_active
+        and time.monotonic() - feed["started"] >= FEED_RESTART_SECONDS
+    ):
+        with get_feed_lock():
+            # Another session may already have replaced this feed
+            if get_markets_feed() is feed:
+                feed["watch"].unsubscribe()
+                get_markets_feed.clear()
+                # Serve direct reads until the new listener catches up,
+                # rather than blocking a rerun on every restart
+                get_markets_feed()["timed_out"] = True
+            feed = get_markets_feed()
+
+    if feed["ready"].is_set():
+        return feed["payload"]
+    # Block for the first snapshot once per feed; after a timeout reruns go
+    # straight to the shared direct read instead of stalling again
+    if not feed["timed_out"]:
+        if feed["ready"].wait(timeout=FEED_WAIT_SECONDS):
+            return feed["payload"]
+        feed["timed_out"] = True
+    return read_current_markets()
+
+
+@st.cache_data(ttl=MOVERS_CACHE_TTL, show_spinner=False)
+def load_recent_movers_raw(limit_docs: int = MOVER_DOC_LIMIT) -> Dict[str, List]:
     """
-    Read the last `limit_docs` mover snapshots, return raw rows
-    with both raw timestamp and ticker so we can aggregate per team.
+    Read the last `limit_docs` mover snapshots, return raw columns with
+    both raw timestamp and ticker so we can aggregate per team. Snapshots
+    of any age are listed; the WINDOW_HOURS cutoff applies only to the net
+    change (compute_net_changes_by_ticker).
+
+    If the writer maintains a denormalized cfp_markets/latest_movers doc
+    (newest-first "items", each with its own "timestamp"), that single
+    read is used instead of the movers query; whether it exists is
+    rechecked every LATEST_MOVERS_CHECK_TTL seconds.
     """
-    docs = (
-        db.collection("movers")
-        .order_by("timestamp", direction=firestore.Query.DESCENDING)
-        .limit(limit_docs)
-        .stream()
+    # Accumulate column-wise so the DataFrame is built from a dict of lists
+    cols: Dict[str, List] = {
+        "timestamp_raw": [],
+        "ticker": [],
+        "old": [],
+        "new": [],
+        "change": [],
+    }
+
+    latest = (
+        db.collection("cfp_markets").document("latest_movers").get()
+        if has_latest_movers_doc()
+        else None
     )
-
-    rows: List[Dict] = []
-    for d in docs:
-        blob = d.to_dict() or {}
-        ts = blob.get("timestamp")
-        if not ts:
-            continue
-
-        for item in blob.get("items", []):
-            rows.append(
-                {
-                    "timestamp_raw": ts,
-                    "ticker": item.get("ticker"),
-                    "team": team_from_ticker(item.get("ticker")),
-                    "old": item.get("old"),
-                    "new": item.get("new"),
-                    "change": item.get("change"),
+    if latest is not None and latest.exists:
+        # Same cap as the query: items from the newest `limit_docs` snapshots
+        items: List[Dict] = []
+        snapshots = set()
+        for item in (latest.to_dict() or {}).get("items", []):
+            ts = item.get("timestamp")
+            if not ts:
+                continue
+            if ts not in snapshots:
+                if len(snapshots) == limit_docs:
+                    break
+                snapshots.add(ts)
+            items.append(item)
+        cols["timestamp_raw"] = [item["timestamp"] for item in items]
+        cols["ticker"] = [item.get("ticker") for item in items]
+        cols["old"] = [item.get("old") for item in items]
+        cols["new"] = [item.get("new") for item in items]
+        cols["change"] = [item.get("change") for item in items]
+        return cols
+
+    store = get_movers_store(limit_docs)
+    with store["lock"]:
+        # Only ask for docs from the newest held one on; the first load reads
+        # the last `limit_docs`. The cursor is that doc's parsed time cut to
+        # whole seconds with no zone suffix, so ">=" matches every same-second
+        # form ("...Z", "....5+00:00"); re-read docs are dropped by id.
+        known = store["docs"]
+        query = db.collection("movers").select(["timestamp", "items"])  # only the fields read below
+        if known:
+            since = known[0]["ts_dt"].strftime("%Y-%m-%dT%H:%M:%S")
+            query = query.where(filter=FieldFilter("timestamp", ">=", since))
+        docs = [
+            {**(d.to_dict() or {}), "id": d.id}
+            for d in query.order_by("timestamp", direction=firestore.Query.DESCENDING)
+            .limit(limit_docs)
+            .stream()
+        ]
+
+        # Unparseable or future (writer clock skew) timestamps would pin the
+        # cursor ahead of real snapshots, so they are never stored
+        ts_dt = parse_ts_utc(pd.Series([d.get("timestamp") for d in docs], dtype=object))
+        now = pd.Timestamp.now(tz="UTC")
+        held = {d["id"]: d for d in known}
+        for d, t in zip(docs, ts_dt):
+            if pd.notna(t) and t <= now:
+                held[d["id"]] = {
+                    "id": d["id"],
+                    "timestamp": d["timestamp"],
+                    "ts_dt": t,
+                    "items": d.get("items", []),
                 }
-            )
-    return rows
+        store["docs"] = sorted(held.values(), key=lambda d: d["ts_dt"], reverse=True)[:limit_docs]
+        window = [(d["timestamp"], d["items"]) for d in store["docs"]]
+
+    for ts, items in window:
+        cols["timestamp_raw"].extend([ts] * len(items))
+        cols["ticker"].extend([item.get("ticker") for item in items])
+        cols["old"].extend([item.get("old") for item in items])
+        cols["new"].extend([item.get("new") for item in items])
+        cols["change"].extend([item.get("change") for item in items])
+    return cols
 
 
-def compute_net_changes_by_ticker(movers_df: pd.DataFrame, hours: int) -> Dict[str, float]:
+def compute_net_changes_by_ticker(
+    movers_df: pd.DataFrame, hours: int, now: pd.Timestamp
+) -> pd.Series:
     """
     From the movers dataframe, compute net change in price for each ticker
-    over the last `hours` hours.
+    over the `hours` hours before `now`. Returned as a float Series indexed
+    by ticker so callers can align it against a ticker array in one step.
     """
     if movers_df.empty:
-        return {}
+        return pd.Series(dtype=float)
 
-    now_utc = datetime.datetime.now(datetime.timezone.utc)
-    cutoff = now_utc - datetime.timedelta(hours=hours)
+    cutoff = now - pd.Timedelta(hours=hours)
 
-    movers_df = movers_df.copy()
-    movers_df["ts_dt"] = movers_df["timestamp_raw"].apply(parse_ts_utc)
-    recent = movers_df[movers_df["ts_dt"].notna()]
-    recent = recent[recent["ts_dt"] >= cutoff]
+    # NaT (unparseable) timestamps never satisfy the comparison
+    recent = movers_df[movers_df["ts_dt"] >= cutoff]
 
     if recent.empty:
-        return {}
+        return pd.Series(dtype=float)
 
-    net = recent.groupby("ticker")["change"].sum().to_dict()
-    return net
+    # factorize + bincount: one C pass, no groupby machinery (NaN tickers -> -1)
+    codes, tickers = pd.factorize(recent["ticker"].to_numpy())
+    changes = recent["change"].to_numpy(dtype=float)
+    keep = (codes >= 0) & ~np.isnan(changes)
+    sums = np.bincount(codes[keep], weights=changes[keep], minlength=len(tickers))
+    return pd.Series(sums, index=pd.Index(tickers))
 
 
 # -------------------------
@@ -179,20 +410,36 @@ if not payload:
     st.stop()
 
 markets = payload.get("markets", [])
-df = pd.DataFrame(markets)
 
-if df.empty:
+if not markets:
     st.error("Markets array is empty in Firestore.")
     st.stop()
 
-df = df.sort_values("probability", ascending=False, na_position="last")
+# Sort on plain arrays; the ticker and prices table both reuse this order.
+# Only markets with a probability are ranked (descending); those without
+# one are split off up front and kept after them for the prices table.
+tickers = np.array([m.get("ticker") for m in markets], dtype=object)
+probs = np.array([m.get("probability") for m in markets], dtype=float)
+missing = np.isnan(probs)
+ranked = np.flatnonzero(~missing)
+order = np.concatenate(
+    [ranked[np.argsort(-probs[ranked], kind="stable")], np.flatnonzero(missing)]
+)
+n_ranked = len(ranked)
+tickers = tickers[order]
+probs = probs[order]
 
 # -------------------------
 # LOAD MOVERS + NET CHANGES
 # -------------------------
-mover_rows = load_recent_movers_raw()
-movers_df = pd.DataFrame(mover_rows)
-net_changes = compute_net_changes_by_ticker(movers_df, WINDOW_HOURS)
+# One clock read per rerun, shared by the net-change window and the table
+now_utc = pd.Timestamp.now(tz="UTC")
+
+mover_cols = load_recent_movers_raw()
+movers_df = pd.DataFrame(mover_cols)
+if not movers_df.empty:
+    movers_df["ts_dt"] = parse_ts_utc(movers_df["timestamp_raw"])
+net_changes = compute_net_changes_by_ticker(movers_df, WINDOW_HOURS, now_utc)
 
 # -------------------------
 # HEADER
@@ -203,99 +450,49 @@ st.caption(f"Live probabilities from Kalshi (net change over last {WINDOW_HOURS}
 # -------------------------
 # BUILD TICKER DATA (USING NET CHANGES)
 # -------------------------
-ticker_rows: List[Dict] = []
-
-for _, r in df.iterrows():
-    ticker = r.get("ticker")
-    team = team_from_ticker(ticker)
-    prob = r.get("probability")
-
-    delta_pts = net_changes.get(ticker, 0.0)
-
-    if delta_pts > 0:
-        direction = "up"
-    elif delta_pts < 0:
-        direction = "down"
-    else:
-        direction = "flat"
+teams = np.array([market_team(m) for m in markets], dtype=object)[order]
 
-    ticker_rows.append(
-        {
-            "team": team,
-            "prob_text": prob_text(prob),
-            "delta_pts": delta_pts,
-            "delta_text": delta_points_text(delta_pts),
-            "direction": direction,
-        }
-    )
+# The ticker shows ranked markets only: the leading n_ranked entries
+if net_changes.empty:
+    # No movers in the window (e.g. cold start): every ticker is flat
+    deltas = np.zeros(n_ranked)
+else:
+    deltas = net_changes.reindex(tickers[:n_ranked], fill_value=0.0).to_numpy(dtype=float)
 
 # -------------------------
 # TICKER HTML
 # -------------------------
-ticker_items_html = ""
-for item in ticker_rows:
-    arrow = "▲" if item["direction"] == "up" else "▼" if item["direction"] == "down" else ""
-    cls = {"up": "delta-up", "down": "delta-down", "flat": "delta-flat"}[item["direction"]]
+# Steady state: the feed and movers window rarely change between refreshes,
+# so key the markup on exactly what it renders and reuse it per session.
+# The key is kept whole (not hashed) so a match is exact.
+ticker_key = (tuple(teams[:n_ranked]), probs[:n_ranked].tobytes(), deltas.tobytes())
+if st.session_state.get("ticker_key") == ticker_key:
+    ticker_html = st.session_state["ticker_html"]
+else:
+    prob_texts = np.char.add(np.char.mod("%.1f", probs[:n_ranked] * 100), "%")
+    directions = np.sign(deltas).astype(np.int8)
 
-    # Example: "TEX 45.0%  ▲ +8"
-    ticker_items_html += f"""
-      <div class="ticker-item">
-        <span class="ticker-team">{item['team']}</span>
-        <span class="ticker-prob">{item['prob_text']}</span>
-        <span class="ticker-delta {cls}">{arrow} {item['delta_text']}</span>
-      </div>
-    """
+    # One record per pill, keyed by TICKER_ITEM_HTML's placeholders.
+    # Team names come straight from Firestore, so escape them for the markup;
+    # probability/delta text is generated here and already safe.
+    ticker_rows: List[Dict] = [
+        {
+            "team": html.escape(team),
+            "prob": p_text,
+            "delta": delta_points_text(delta_pts),
+            **DIRECTION_STYLE[direction],
+        }
+        for team, p_text, delta_pts, direction in zip(
+            teams[:n_ranked], prob_texts.tolist(), deltas.tolist(), directions.tolist()
+        )
+    ]
 
-track_html = ticker_items_html + ticker_items_html
+    # Sent once; the skeleton's script appends the second copy for the loop
+    track_html = "".join(TICKER_ITEM_HTML.format_map(row) for row in ticker_rows)
 
-ticker_html = f"""
-<html>
-<head>
-<style>
-body {{ margin:0; padding:0; }}
-.ticker-wrapper {{
-  width: 100%; background:#020617; overflow:hidden;
-  border-radius:16px; padding:8px 0;
-  border:1px solid rgba(148,163,184,0.5);
-  box-shadow:0 10px 24px rgba(15,23,42,0.9);
-}}
-.ticker-track {{
-  display:inline-flex; white-space:nowrap;
-  animation:scroll 50s linear infinite;
-}}
-@keyframes scroll {{
-  from {{ transform:translateX(0%); }}
-  to   {{ transform:translateX(-50%); }}
-}}
-.ticker-item {{
-  display:inline-flex; align-items:baseline; gap:6px;
-  padding:4px 14px; margin-right:18px;
-  border-radius:999px;
-  background:rgba(255,255,255,0.06);
-  font-family:sans-serif; font-size:0.9rem;
-}}
-.ticker-team {{
-  color:#fff; font-weight:600; text-transform:uppercase;
-  letter-spacing:0.07em;
-}}
-.ticker-prob {{
-  color:#a5b4fc; font-variant-numeric:tabular-nums;
-}}
-.ticker-delta {{
-  font-size:0.8rem; font-variant-numeric:tabular-nums;
-}}
-.delta-up   {{ color:#22c55e; }}
-.delta-down {{ color:#ef4444; }}
-.delta-flat {{ color:#94a3b8; }}
-</style>
-</head>
-<body>
-<div class="ticker-wrapper">
-  <div class="ticker-track">{track_html}</div>
-</div>
-</body>
-</html>
-"""
+    ticker_html = TICKER_HTML_TEMPLATE.replace("{TRACK}", track_html)
+    st.session_state["ticker_key"] = ticker_key
+    st.session_state["ticker_html"] = ticker_html
 
 st.markdown("### 📈 Live Ticker")
 components.html(ticker_html, height=70, scrolling=False)
@@ -308,13 +505,26 @@ st.markdown("### 🔥 Recent Movers")
 if movers_df.empty:
     st.info("No movers recorded yet.")
 else:
-    movers_df = movers_df.copy()
-    movers_df["time"] = movers_df["timestamp_raw"].apply(pretty_time)
-    movers_df["direction"] = movers_df["change"].apply(
-        lambda x: "🟢 UP" if x > 0 else ("🔴 DOWN" if x < 0 else "⚪ FLAT")
+    # Few distinct tickers over many rows: as categoricals the team lookup runs
+    # once per category and both columns hold int codes plus a small dictionary.
+    # Label teams as the ticker and prices table do; the split is only for
+    # tickers no longer in the current markets.
+    movers_df["ticker"] = movers_df["ticker"].astype("category")
+    team_by_ticker = dict(zip(tickers, teams))
+    category_teams = [
+        team_by_ticker.get(t) or team_from_ticker(t) for t in movers_df["ticker"].cat.categories
+    ]
+    # Trailing "" is picked by code -1 (missing ticker)
+    movers_df["team"] = pd.Categorical(
+        np.array(category_teams + [""], dtype=object)[movers_df["ticker"].cat.codes.to_numpy()]
+    )
+    movers_df["time"] = pretty_times(movers_df["ts_dt"], movers_df["timestamp_raw"], now_utc)
+    change = movers_df["change"].to_numpy(dtype=float)
+    movers_df["direction"] = np.select(
+        [change > 0, change < 0], ["🟢 UP", "🔴 DOWN"], default="⚪ FLAT"
     )
 
-    display_movers = movers_df[["time", "team", "old", "new", "change", "direction"]]
+    display_movers = movers_df[MOVER_DISPLAY_COLS.intersection(movers_df.columns, sort=False)]
     st.dataframe(
         display_movers,
         hide_index=True,
@@ -326,20 +536,24 @@ else:
 # ============================================================
 st.markdown("### 📊 Current Prices")
 
-def pick_price(row: pd.Series):
-    if pd.notna(row.get("yes_price")):
-        return row.get("yes_price")
-    return row.get("last_price")
-
-df_prices = df.copy()
-df_prices["team"] = df_prices["ticker"].apply(team_from_ticker)
-df_prices["probability (%)"] = df_prices["probability"].apply(prob_pct)
-df_prices["price"] = df_prices.apply(pick_price, axis=1)
-
-clean_prices = df_prices[["team", "probability (%)", "price"]]
+# Built from the already-sorted arrays as an Arrow table, which st.dataframe
+# serializes as-is (no pandas frame, no pandas -> Arrow conversion).
+# Price prefers yes_price, falling back to last_price.
+yes_prices = np.array([m.get("yes_price") for m in markets], dtype=float)[order]
+last_prices = np.array([m.get("last_price") for m in markets], dtype=float)[order]
+prices = np.where(np.isnan(yes_prices), last_prices, yes_prices)
+
+# from_pandas=True stores NaN as null so missing values render blank
+clean_prices = pa.table(
+    {
+        "team": pa.array(teams, type=pa.string()),
+        "probability (%)": pa.array(np.round(probs * 100, 1), from_pandas=True),
+        "price": pa.array(prices, from_pandas=True),
+    }
+)
 
 st.dataframe(
-    clean_prices.sort_values("probability (%)", ascending=False),
+    clean_prices,
     hide_index=True,
     use_container_width=True,
 )